@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from app.utils import embed_chunks
-from app.database.document_crud import get_chunk_collection, get_document_collection, get_chat_collection, get_user_collection
+from app.database.document_crud import get_chunk_collection, get_document_collection, get_chat_collection, get_user_collection, user_filter, chunk_filter
 from bson import ObjectId
 import numpy as np
 from app.models.chats import QueryRequest
@@ -39,15 +39,15 @@ async def query_documents(request: QueryRequest):
 
     # Step 2: Build filter for chunks
     chunk_collection = get_chunk_collection()
-    chunk_filter = {"user_id": request.user_id}
+    doc_ids = None
     if request.doc_ids:
         valid_ids = [ObjectId(doc_id) for doc_id in request.doc_ids if ObjectId.is_valid(doc_id)]
         if not valid_ids:
             raise HTTPException(status_code=400, detail="No valid document IDs provided.")
-        chunk_filter["document_id"] = {"$in": [str(oid) for oid in valid_ids]}
+        doc_ids = [str(oid) for oid in valid_ids]
 
     # Step 3: Fetch all relevant chunks
-    chunks_cursor = chunk_collection.find(chunk_filter)
+    chunks_cursor = chunk_collection.find(chunk_filter(request.user_id, doc_ids))
     chunks = await chunks_cursor.to_list(length=1000)
     if not chunks:
         raise HTTPException(status_code=404, detail="No chunks found for the given user and documents.")
@@ -92,7 +92,7 @@ async def query_documents(request: QueryRequest):
     today = datetime.utcnow().date().isoformat()
     # Try to update today's stats, or create if not exists
     await user_collection.update_one(
-        {"user_id": request.user_id},
+        user_filter(request.user_id),
         {
             "$inc": {"total_query_count": 1, "total_token_count": token_count, f"daily_stats.{today}.query_count": 1, f"daily_stats.{today}.token_count": token_count},
             "$setOnInsert": {"created_at": now}
@@ -139,7 +139,7 @@ async def query_documents(request: QueryRequest):
 @router.get("/chats/{user_id}")
 async def list_chats(user_id: str):
     chat_collection = get_chat_collection()
-    chats = await chat_collection.find({"user_id": user_id}).to_list(length=100)
+    chats = await chat_collection.find(user_filter(user_id)).to_list(length=100)
     return [
         {"chat_id": str(chat["_id"]), "created_at": chat["created_at"], "chat_name": chat.get("chat_name", "")}
         for chat in chats
@@ -2,6 +2,7 @@
 import app.database.mongo as mongo
 from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import OperationFailure
 
 
 def get_document_collection():
@@ -24,6 +25,22 @@ def get_user_collection():
         raise RuntimeError("Database not initialized. Ensure connect_to_mongo() is called.")
     return mongo.db["users"]
 
+# ============== query filters ===============
+# Shared by the endpoints and check_index_coverage() so every hot query shape is explained
+
+def user_filter(user_id: str) -> dict:
+    # documents, chats and users are all looked up by user_id
+    return {"user_id": user_id}
+
+def chunk_filter(user_id: str, doc_ids: list[str] | None = None) -> dict:
+    query = {"user_id": user_id}
+    if doc_ids:
+        query["document_id"] = {"$in": doc_ids}
+    return query
+
+def chunks_by_documents_filter(doc_ids: list[str]) -> dict:
+    return {"document_id": {"$in": doc_ids}}
+
 async def create_document(doc: dict):
     collection = get_document_collection()
     doc["created_at"] = datetime.utcnow()
@@ -33,7 +50,7 @@ async def create_document(doc: dict):
 
 async def get_documents_by_user(user_id: str):
     collection = get_document_collection()
-    docs = await collection.find({"user_id": user_id}).to_list(length=100)
+    docs = await collection.find(user_filter(user_id)).to_list(length=100)
     for doc in docs:
         doc["_id"] = str(doc["_id"])
     return docs
@@ -68,12 +85,80 @@ async def store_chunks(doc_id: str, user_id: str, chunks: list[str], embeddings:
         }
         for chunk, embedding in zip(chunks, embeddings)
     ]
-    await chunks_collection.insert_many(documents)
+    # Write in bounded unordered batches so a large document doesn't become one huge request
+    batch_size = mongo.CHUNK_INSERT_BATCH_SIZE
+    try:
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            await chunks_collection.insert_many(batch, ordered=False)
+    except Exception:
+        # Don't leave a partial set of chunks behind, a retry would store them twice
+        await chunks_collection.delete_many(chunks_by_documents_filter([doc_id]))
+        raise
 
 async def ensure_indexes():
-    # Ensure compound index on user_id and document_id in document_chunks
+    # documents: listed and deleted by user_id
     collection = get_document_collection()
-    await collection.create_index([("user_id", 1), ("document_id", 1)])
-    # Ensure compound index on user_id and document_id in document_chunks
+    # Drop the old (user_id, document_id) index, documents have no document_id field
+    if "user_id_1_document_id_1" in await collection.index_information():
+        await collection.drop_index("user_id_1_document_id_1")
+    await collection.create_index([("user_id", 1)])
+    # document_chunks: queried by user_id (+ document_id), deleted by document_id
     chunk_collection = get_chunk_collection()
-    await chunk_collection.create_index([("user_id", 1), ("document_id", 1)])
\ No newline at end of file
+    await chunk_collection.create_index([("user_id", 1), ("document_id", 1)])
+    await chunk_collection.create_index([("document_id", 1)])
+    # chats: listed and deleted by user_id
+    chat_collection = get_chat_collection()
+    await chat_collection.create_index([("user_id", 1)])
+    # users: one stats document per user_id, also keeps the upsert from creating duplicates
+    await ensure_unique_user_index()
+
+async def ensure_unique_user_index():
+    user_collection = get_user_collection()
+    # Already built (or a non-unique fallback that merge_user_stats upgrades), nothing to scan
+    if "user_id_1" in await user_collection.index_information():
+        return
+    try:
+        await user_collection.create_index([("user_id", 1)], unique=True)
+    except OperationFailure as e:
+        # Duplicate stats documents from before the index existed; keep serving with a plain index
+        print(f"⚠️ Could not build unique users.user_id index, using non-unique index: {e}")
+        print("   Run `python -m app.database.merge_user_stats` to merge them and build the unique index.")
+        await user_collection.create_index([("user_id", 1)])
+
+def _hot_queries():
+    # (collection, filter) pairs for every query on a request path
+    user_id = "__index_check__"
+    doc_ids = [str(ObjectId()), str(ObjectId())]
+    return [
+        (get_document_collection(), user_filter(user_id)),
+        (get_chunk_collection(), chunk_filter(user_id)),
+        (get_chunk_collection(), chunk_filter(user_id, doc_ids)),
+        (get_chunk_collection(), chunks_by_documents_filter(doc_ids)),
+        (get_chat_collection(), user_filter(user_id)),
+        (get_user_collection(), user_filter(user_id)),
+    ]
+
+def _has_collscan(plan) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_has_collscan(value) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_has_collscan(item) for item in plan)
+    return False
+
+async def check_index_coverage():
+    """
+    Explain every hot query and raise if any of them falls back to a COLLSCAN.
+
+    :raises RuntimeError: listing the collections and filters that are not covered by an index
+    """
+    failures = []
+    for collection, query in _hot_queries():
+        explain = await collection.find(query).explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if _has_collscan(winning_plan):
+            failures.append(f"{collection.name}: {query}")
+    if failures:
+        raise RuntimeError("COLLSCAN on hot query path: " + "; ".join(failures))
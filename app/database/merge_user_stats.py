@@ -0,0 +1,64 @@
+# app/database/merge_user_stats.py
+# One-off migration: python -m app.database.merge_user_stats
+import asyncio
+from app.database.mongo import connect_to_mongo, close_mongo_connection
+from app.database.document_crud import get_user_collection
+
+
+async def merge_duplicate_user_stats():
+    """
+    Merge users documents sharing a user_id into the oldest one.
+
+    Concurrent first-time stats upserts could create duplicates before the unique index existed.
+    Each extra is deleted before its counts are added, so two runs never count the same document twice.
+    """
+    user_collection = get_user_collection()
+    duplicates = user_collection.aggregate([
+        {"$group": {"_id": "$user_id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ], allowDiskUse=True)
+    async for group in duplicates:
+        docs = await user_collection.find({"_id": {"$in": group["ids"]}}, {"_id": 1}).sort("created_at", 1).to_list(length=None)
+        keep, extras = docs[0], docs[1:]
+        inc = {}
+        merged = 0
+        for extra in extras:
+            deleted = await user_collection.find_one_and_delete({"_id": extra["_id"]})
+            if not deleted:
+                # Already merged by another run
+                continue
+            merged += 1
+            for field in ("total_query_count", "total_token_count"):
+                inc[field] = inc.get(field, 0) + deleted.get(field, 0)
+            for day, stats in deleted.get("daily_stats", {}).items():
+                for field in ("query_count", "token_count"):
+                    key = f"daily_stats.{day}.{field}"
+                    inc[key] = inc.get(key, 0) + stats.get(field, 0)
+        if inc:
+            await user_collection.update_one({"_id": keep["_id"]}, {"$inc": inc})
+        print(f"Merged {merged} duplicate stats documents for user {group['_id']}")
+
+
+async def build_unique_user_index():
+    user_collection = get_user_collection()
+    existing = (await user_collection.index_information()).get("user_id_1")
+    if existing and existing.get("unique"):
+        return
+    # Replace the non-unique fallback left by ensure_indexes()
+    if existing:
+        await user_collection.drop_index("user_id_1")
+    await user_collection.create_index([("user_id", 1)], unique=True)
+    print("✅ Unique users.user_id index built")
+
+
+async def main():
+    await connect_to_mongo()
+    try:
+        await merge_duplicate_user_stats()
+        await build_unique_user_index()
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
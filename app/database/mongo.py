@@ -1,4 +1,3 @@
-
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
@@ -8,12 +7,42 @@ load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI") or "mongodb://localhost:27017"
 MONGO_DB_NAME = os.getenv("MONGO_DB_NAME") or "knowyourdocs"
 
+# Connection pool / timeout tuning (override via env)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+# Unset (0) by default like the driver, so long index builds / bulk deletes are not cut off
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+# Comma separated, e.g. "zstd,snappy,zlib" (zstd/snappy need their extra packages).
+# Off by default like the driver: embeddings compress poorly and it costs CPU per message.
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+# Max chunks per insert_many when storing document embeddings
+CHUNK_INSERT_BATCH_SIZE = int(os.getenv("CHUNK_INSERT_BATCH_SIZE", "256"))
+if CHUNK_INSERT_BATCH_SIZE < 1:
+    raise RuntimeError("CHUNK_INSERT_BATCH_SIZE must be at least 1.")
+
 client: AsyncIOMotorClient = None
 db = None
 
+def get_client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+    }
+    if MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = MONGO_SOCKET_TIMEOUT_MS
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
 async def connect_to_mongo():
     global client, db
-    client = AsyncIOMotorClient(MONGO_URI)
+    client = AsyncIOMotorClient(MONGO_URI, **get_client_options())
     db = client[MONGO_DB_NAME]
     print("✅ Connected to MongoDB")
 
@@ -21,4 +50,4 @@ async def close_mongo_connection():
     global client
     if client:
         client.close()
-        print("❌ MongoDB connection closed")
\ No newline at end of file
+        print("❌ MongoDB connection closed")
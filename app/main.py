@@ -1,9 +1,10 @@
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import documents,chats, users
 # from fastapi.staticfiles import StaticFiles
 from app.database.mongo import connect_to_mongo, close_mongo_connection
-from app.database.document_crud import ensure_indexes
+from app.database.document_crud import ensure_indexes, check_index_coverage
 
 app = FastAPI(title="Document Q&A Platform")
 
@@ -21,6 +22,9 @@ app.add_middleware(
 async def startup_event():
     await connect_to_mongo()
     await ensure_indexes()
+    # Fail startup if a hot query path would do a collection scan
+    if os.getenv("MONGO_CHECK_INDEXES", "").lower() in ("1", "true", "yes"):
+        await check_index_coverage()
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -0,0 +1,132 @@
+import asyncio
+import os
+from uuid import uuid4
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+import app.database.mongo as mongo
+from app.database.document_crud import (
+    _has_collscan,
+    check_index_coverage,
+    ensure_indexes,
+    get_chat_collection,
+    get_chunk_collection,
+    get_document_collection,
+    get_user_collection,
+)
+from app.database.merge_user_stats import build_unique_user_index, merge_duplicate_user_stats
+
+MONGO_TEST_URI = os.getenv("MONGO_TEST_URI") or "mongodb://localhost:27017"
+
+
+def run_with_db(test):
+    # Throwaway database per test, dropped afterwards
+    async def runner():
+        client = AsyncIOMotorClient(MONGO_TEST_URI, serverSelectionTimeoutMS=2000)
+        try:
+            await client.admin.command("ping")
+        except PyMongoError:
+            client.close()
+            pytest.skip(f"MongoDB not reachable at {MONGO_TEST_URI}")
+        db_name = f"test_index_coverage_{uuid4().hex}"
+        mongo.client, mongo.db = client, client[db_name]
+        try:
+            await seed()
+            await test()
+        finally:
+            await client.drop_database(db_name)
+            client.close()
+            mongo.client, mongo.db = None, None
+
+    asyncio.run(runner())
+
+
+async def seed():
+    # Non-empty collections so the planner has something to scan
+    await get_document_collection().insert_one({"user_id": "u1", "filename": "a.pdf"})
+    await get_chunk_collection().insert_one({"user_id": "u1", "document_id": "d1", "chunk": "text", "embedding": [0.0]})
+    await get_chat_collection().insert_one({"user_id": "u1", "chat_name": "chat", "messages": []})
+    await get_user_collection().insert_one({"user_id": "u1", "total_query_count": 1})
+
+
+def test_has_collscan_plain_collscan():
+    assert _has_collscan({"stage": "COLLSCAN", "direction": "forward"})
+
+
+def test_has_collscan_fetch_ixscan():
+    plan = {
+        "stage": "FETCH",
+        "inputStage": {"stage": "IXSCAN", "keyPattern": {"user_id": 1}, "indexName": "user_id_1"},
+    }
+    assert not _has_collscan(plan)
+
+
+def test_has_collscan_nested_shard_plan():
+    plan = {
+        "stage": "SHARD_MERGE",
+        "shards": [
+            {
+                "shardName": "shard0",
+                "winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "user_id_1"}},
+            },
+            {
+                "shardName": "shard1",
+                "winningPlan": {"stage": "SHARDING_FILTER", "inputStage": {"stage": "COLLSCAN"}},
+            },
+        ],
+    }
+    assert _has_collscan(plan)
+
+
+def test_hot_queries_use_indexes():
+    async def test():
+        await ensure_indexes()
+        await check_index_coverage()
+
+    run_with_db(test)
+
+
+def test_collscan_is_reported_without_indexes():
+    async def test():
+        with pytest.raises(RuntimeError, match="COLLSCAN"):
+            await check_index_coverage()
+
+    run_with_db(test)
+
+
+def test_duplicate_user_stats_fall_back_to_non_unique_index():
+    async def test():
+        users = get_user_collection()
+        await users.insert_one({"user_id": "u1", "total_query_count": 2})
+        await ensure_indexes()
+
+        assert not (await users.index_information())["user_id_1"].get("unique")
+        await check_index_coverage()
+
+    run_with_db(test)
+
+
+def test_merge_user_stats_merges_duplicates_and_builds_unique_index():
+    async def test():
+        users = get_user_collection()
+        await users.insert_one({
+            "user_id": "u1",
+            "total_query_count": 2,
+            "total_token_count": 50,
+            "daily_stats": {"2026-01-01": {"query_count": 2, "token_count": 50}},
+        })
+        await ensure_indexes()
+        await merge_duplicate_user_stats()
+        await build_unique_user_index()
+        # A second run has nothing left to merge and must not double count
+        await merge_duplicate_user_stats()
+
+        docs = await users.find({"user_id": "u1"}).to_list(length=None)
+        assert len(docs) == 1
+        assert docs[0]["total_query_count"] == 3
+        assert docs[0]["daily_stats"]["2026-01-01"]["query_count"] == 2
+        assert (await users.index_information())["user_id_1"]["unique"]
+
+    run_with_db(test)